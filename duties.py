@@ -84,3 +84,21 @@ def update(ctx: Context) -> None:
     ctx.run(["uv", "lock", "--upgrade"], title="update uv lock")
     ctx.run(["uv", "sync"], title="update uv sync")
     ctx.run(["prek", "autoupdate"], title="prek autoupdate")
+
+
+@duty(capture=CI)
+def bench(ctx: Context) -> None:
+    """Benchmark sabc against a local fake SABnzbd server."""
+    ctx.run(
+        ["uv", "run", "--script", "scripts/bench_sabc.py", "--size", "10", "--size", "1000"],
+        title=pyprefix("sabc benchmark"),
+    )
+
+
+@duty(capture=CI)
+def startup(ctx: Context) -> None:
+    """Check that sabc keeps its heavy imports deferred and report its startup time."""
+    ctx.run(
+        ["uv", "run", "--script", "scripts/check_startup.py"],
+        title=pyprefix("sabc startup imports"),
+    )
@@ -0,0 +1,443 @@
+#!/usr/bin/env -S uv run --script --quiet
+
+"""Benchmark sabc against a local fake SABnzbd server."""
+
+# /// script
+# requires-python = ">=3.13"
+# dependencies = [
+#     "httpx[http2]",
+#     "nclutils>=3.0.0,<4.0.0",
+#     "rich",
+#     "typer",
+# ]
+# ///
+
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+from pathlib import Path
+from time import perf_counter, sleep, time
+from types import ModuleType
+from typing import Annotated
+from urllib.parse import parse_qs, urlparse
+
+import typer
+from nclutils import pp
+from rich.console import Console
+from rich.table import Table
+
+SABC_PATH = Path(__file__).resolve().parent.parent / "dotfiles" / "bin" / "executable_sabc"
+DEFAULT_SIZES = (10, 1_000, 10_000)
+CATEGORIES = ("tv", "movies", "music")
+
+# Ignore slowdowns smaller than this, they are timer noise rather than regressions
+NOISE_FLOOR_SECONDS = 0.05
+
+app = typer.Typer(add_completion=False, rich_markup_mode="rich")
+
+
+# ############## FAKE SABNZBD ##############
+class FakeSabnzbd(ThreadingHTTPServer):
+    """A SABnzbd API stand-in serving a synthetic queue and history.
+
+    Slots are generated from their index on demand, so a history of 100,000 entries costs little more memory than one of ten. Counts requests and TCP connections so a benchmark can check how many round trips a command makes and whether they share a connection.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, queue_size: int, history_size: int, latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), FakeSabnzbdHandler)
+        self.latency = latency
+        self.queue = list(range(queue_size))
+        self.history = list(range(history_size))
+        self.deleted: set[int] = set()
+        self.last_history_update = 1
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.now = int(time())
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_counters(self) -> None:
+        """Zero the request and connection counters."""
+        with self.lock:
+            self.requests = 0
+            self.connections = 0
+
+    def queue_slot(self, i: int) -> dict:
+        """Build the `queue` API slot for the `i`th download."""
+        mb = 1024.0 + i % 4096
+        return {
+            "nzo_id": f"SABnzbd_nzo_q{i}",
+            "filename": f"queue.item.{i}",
+            "cat": CATEGORIES[i % len(CATEGORIES)],
+            "status": "Downloading" if i == 0 else "Queued",
+            "mb": f"{mb:.2f}",
+            "mbleft": f"{mb / 2:.2f}",
+            "percentage": "50",
+            "timeleft": f"0:{i % 60:02}:00",
+        }
+
+    def history_slot(self, i: int) -> dict:
+        """Build the `history` API slot for the `i`th download."""
+        return {
+            "nzo_id": f"SABnzbd_nzo_h{i}",
+            "name": f"history.item.{i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "status": "Failed" if i % 10 == 0 else "Completed",
+            "bytes": 1_073_741_824 + i,
+            "completed": self.now - i * 60,
+            "download_time": 120,
+        }
+
+    def handle_api(self, query: dict[str, str]) -> dict:
+        """Answer one API request.
+
+        Args:
+            query (dict[str, str]): The request's query parameters
+
+        Returns:
+            dict: The JSON response body
+        """
+        mode = query.get("mode")
+        start = int(query.get("start", 0))
+        limit = int(query.get("limit", 0)) or sys.maxsize
+
+        match mode, query.get("name"):
+            case "queue", _:
+                slots = [self.queue_slot(i) for i in self.queue[start : start + limit]]
+                return {"queue": {"slots": slots, "noofslots": len(self.queue)}}
+            case "history", "delete":
+                ids = {
+                    int(nzo_id.removeprefix("SABnzbd_nzo_h"))
+                    for nzo_id in query["value"].split(",")
+                }
+                with self.lock:
+                    self.deleted |= ids
+                    self.last_history_update += 1
+                return {"status": True, "nzo_ids": query["value"].split(",")}
+            case "history", _:
+                with self.lock:
+                    if int(query.get("last_history_update", 0)) == self.last_history_update:
+                        return {"history": False}
+                    if self.deleted:
+                        self.history = [i for i in self.history if i not in self.deleted]
+                        self.deleted.clear()
+                    page = self.history[start : start + limit]
+                    noofslots = len(self.history)
+                return {
+                    "history": {
+                        "slots": [self.history_slot(i) for i in page],
+                        "noofslots": noofslots,
+                        "last_history_update": self.last_history_update,
+                    }
+                }
+            case "warnings", name:
+                return {"status": True} if name == "clear" else {"warnings": []}
+            case _:
+                return {"status": False, "error": f"Unknown mode: {mode}"}
+
+
+class FakeSabnzbdHandler(BaseHTTPRequestHandler):
+    """Request handler for `FakeSabnzbd`, keeping connections alive between requests."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, Nagle's algorithm would hold the body back ~40ms
+    disable_nagle_algorithm = True
+    server: FakeSabnzbd
+
+    def setup(self) -> None:
+        """Count the new connection."""
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args: object) -> None:
+        """Keep the benchmark output clean."""
+
+    def do_GET(self) -> None:
+        """Answer a GET request after the configured latency."""
+        with self.server.lock:
+            self.server.requests += 1
+        sleep(self.server.latency)
+
+        query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        body = json.dumps(self.server.handle_api(query)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# ############## BENCHMARK ##############
+@dataclass
+class Result:
+    """The cost of one operation at one size.
+
+    Attributes:
+        operation (str): Name of the operation
+        size (int): Number of downloads in the queue and history
+        seconds (float): Wall time
+        requests (int): API requests sent
+        connections (int): TCP connections opened
+        peak_kib (float): Peak traced memory allocated during the operation
+    """
+
+    operation: str
+    size: int
+    seconds: float
+    requests: int
+    connections: int
+    peak_kib: float
+
+    @property
+    def key(self) -> str:
+        """Identify the result in a baseline file."""
+        return f"{self.operation}@{self.size}"
+
+
+def _load_sabc() -> ModuleType:
+    """Import sabc from its chezmoi source file.
+
+    The user's own config and cache directories are swapped for an empty temporary one first, so nothing sabc does can touch them.
+
+    Returns:
+        ModuleType: The sabc module
+    """
+    scratch = tempfile.mkdtemp(prefix="bench_sabc_")
+    os.environ |= {"XDG_CONFIG_HOME": scratch, "XDG_CACHE_HOME": scratch}
+    loader = SourceFileLoader("sabc", str(SABC_PATH))
+    module = module_from_spec(spec_from_loader("sabc", loader))
+    sys.modules["sabc"] = module
+    loader.exec_module(module)
+    return module
+
+
+def _measure(server: FakeSabnzbd, operation: str, size: int, func: Callable[[], object]) -> Result:
+    """Run one operation, recording wall time, round trips and peak memory.
+
+    Args:
+        server (FakeSabnzbd): The fake server the operation talks to
+        operation (str): Name of the operation
+        size (int): Number of downloads in the queue and history
+        func (Callable[[], object]): The operation
+
+    Returns:
+        Result: What the operation cost
+    """
+    server.reset_counters()
+    tracemalloc.reset_peak()
+    # Both are zero when memory is not traced
+    baseline, _ = tracemalloc.get_traced_memory()
+    started = perf_counter()
+    func()
+    seconds = perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    return Result(
+        operation=operation,
+        size=size,
+        seconds=seconds,
+        requests=server.requests,
+        connections=server.connections,
+        peak_kib=(peak - baseline) / 1024,
+    )
+
+
+def _bench_size(sabc: ModuleType, server: FakeSabnzbd, size: int) -> list[Result]:
+    """Benchmark every operation against a queue and history of `size` downloads.
+
+    Args:
+        sabc (ModuleType): The sabc module
+        server (FakeSabnzbd): The fake server, already filled with `size` downloads
+        size (int): Number of downloads in the queue and history
+
+    Returns:
+        list[Result]: One result per operation
+    """
+    config = sabc.SabcConfig(sabnzbd_url=server.url, sabnzbd_api_key="bench")
+    console = Console(file=io.StringIO(), width=160)
+    results = []
+    loaded: dict[str, list] = {}
+    nzbs_to_table = sabc._nzbs_to_table  # noqa: SLF001
+
+    def bench(operation: str, func: Callable[[], object]) -> None:
+        results.append(_measure(server, operation, size, func))
+
+    # A fresh client per size so every run pays for its own connections
+    with sabc.SABAPI(config.sabnzbd_url, config.sabnzbd_api_key, page_size=config.page_size) as api:
+        bench("get_queue", lambda: loaded.setdefault("queue", api.get_queue()))
+        bench("get_history", api.get_history)
+        bench(
+            "iter_history",
+            lambda: loaded.setdefault("history", list(api.iter_history(prefetch=True))),
+        )
+        bench(
+            "render",
+            lambda: console.print(nzbs_to_table(loaded["queue"] + loaded["history"])),
+        )
+        bench(
+            "delete_history",
+            lambda: api.delete_history(
+                loaded["history"],
+                batch_size=config.delete_batch_size,
+                concurrency=config.delete_concurrency,
+            ),
+        )
+    return results
+
+
+def _results_table(results: list[Result], regressions: set[str]) -> Table:
+    """Format benchmark results, flagging regressions in red.
+
+    Args:
+        results (list[Result]): The benchmark results
+        regressions (set[str]): Keys of results that regressed against the baseline
+
+    Returns:
+        Table: The results
+    """
+    table = Table(title="sabc benchmark")
+    table.add_column("Operation")
+    table.add_column("Size", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Requests", justify="right")
+    table.add_column("Connections", justify="right")
+    table.add_column("Peak KiB", justify="right")
+    for result in results:
+        table.add_row(
+            result.operation,
+            f"{result.size:,}",
+            f"{result.seconds:.3f}",
+            str(result.requests),
+            str(result.connections),
+            f"{result.peak_kib:,.0f}",
+            style="red" if result.key in regressions else None,
+        )
+    return table
+
+
+def _find_regressions(results: list[Result], baseline: dict, tolerance: float) -> list[str]:
+    """Compare results against a saved baseline.
+
+    A result regresses when it sends more requests or opens more connections than the baseline, or when its wall time or peak memory grows by more than `tolerance`.
+
+    Args:
+        results (list[Result]): The benchmark results
+        baseline (dict): Results saved by an earlier run with `--save`
+        tolerance (float): Allowed relative growth of wall time and memory
+
+    Returns:
+        list[str]: One line per regression
+    """
+    regressions = []
+    for result in results:
+        if (saved := baseline.get(result.key)) is None:
+            continue
+        regressions.extend(
+            f"{result.key}: {metric} {saved[metric]} -> {getattr(result, metric)}"
+            for metric in ("requests", "connections")
+            if getattr(result, metric) > saved[metric]
+        )
+        if (
+            result.seconds > saved["seconds"] * (1 + tolerance)
+            and result.seconds - saved["seconds"] > NOISE_FLOOR_SECONDS
+        ):
+            regressions.append(
+                f"{result.key}: seconds {saved['seconds']:.3f} -> {result.seconds:.3f}"
+            )
+        if result.peak_kib > saved["peak_kib"] * (1 + tolerance):
+            regressions.append(
+                f"{result.key}: peak KiB {saved['peak_kib']:,.0f} -> {result.peak_kib:,.0f}"
+            )
+    return regressions
+
+
+@app.command()
+def main(
+    sizes: Annotated[
+        list[int] | None,
+        typer.Option("--size", help="Downloads in the queue and history, repeat for several sizes"),
+    ] = None,
+    latency: Annotated[
+        float, typer.Option(help="Seconds the fake server waits before answering each request")
+    ] = 0.0,
+    baseline: Annotated[
+        Path | None,
+        typer.Option(help="Compare against results saved by --save, exit 1 on regressions"),
+    ] = None,
+    save: Annotated[Path | None, typer.Option(help="Save the results as a baseline")] = None,
+    tolerance: Annotated[
+        float, typer.Option(help="Allowed relative growth of wall time and memory")
+    ] = 0.25,
+    trace_memory: Annotated[  # noqa: FBT002
+        bool,
+        typer.Option(
+            "--memory/--no-memory",
+            help="Trace peak memory, which slows Python-heavy operations such as rendering",
+        ),
+    ] = True,
+) -> None:
+    """Benchmark sabc's API client and rendering against a local fake SABnzbd server.
+
+    Each size fills the fake server with that many queued and historical downloads, then times fetching the queue, the first page of history, the whole history, rendering the table and deleting the whole history. Requests, connections and peak memory are recorded alongside wall time so a change that adds round trips shows up even when the server is fast.
+
+    [bold underline]Examples:[/bold underline]
+        [dim]Run the default sizes[/dim]
+        $ scripts/bench_sabc.py
+
+        [dim]Check how a history of 100,000 downloads scales, without the cost of tracing memory[/dim]
+        $ scripts/bench_sabc.py --size 100000 --no-memory
+
+        [dim]Save a baseline, then check a change against it with 20ms of latency per request[/dim]
+        $ scripts/bench_sabc.py --latency 0.02 --save bench.json
+        $ scripts/bench_sabc.py --latency 0.02 --baseline bench.json
+    """
+    pp.configure(verbosity=0, quiet=True)
+    sizes = sizes or list(DEFAULT_SIZES)
+
+    sabc = _load_sabc()
+    results: list[Result] = []
+    if trace_memory:
+        tracemalloc.start()
+    for size in sizes:
+        server = FakeSabnzbd(queue_size=size, history_size=size, latency=latency)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            results.extend(_bench_size(sabc, server, size))
+        finally:
+            server.shutdown()
+            server.server_close()
+    tracemalloc.stop()
+
+    regressions = []
+    if baseline:
+        regressions = _find_regressions(results, json.loads(baseline.read_text()), tolerance)
+
+    console = Console()
+    console.print(_results_table(results, {line.split(":", 1)[0] for line in regressions}))
+    if save:
+        save.write_text(json.dumps({r.key: asdict(r) for r in results}, indent=2) + "\n")
+        console.print(f"Saved baseline to {save}")
+    if regressions:
+        for line in regressions:
+            console.print(f"[red]Regression[/red] {line}")
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
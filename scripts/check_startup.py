@@ -0,0 +1,159 @@
+#!/usr/bin/env -S uv run --script --quiet
+
+"""Check that sabc defers its heavy imports, and report how long it takes to start."""
+
+# /// script
+# requires-python = ">=3.13"
+# dependencies = [
+#     "httpx[http2]",
+#     "nclutils>=3.0.0,<4.0.0",
+#     "rich",
+#     "typer",
+# ]
+# ///
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+SABC_PATH = Path(__file__).resolve().parent.parent / "dotfiles" / "bin" / "executable_sabc"
+
+# Modules sabc defers until they are used. Importing one at startup is a regression whatever the
+# timing says.
+DEFERRED_MODULES = ("httpx", "rich.json", "typer.rich_utils")
+
+# Run the script the way `uv run --script` does: compiled from source, since scripts are never
+# cached as bytecode, but named so typer's app is not invoked.
+STARTUP_PROBE = """
+import runpy, sys, time
+started = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name="sabc_startup")
+print(time.perf_counter() - started)
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+app = typer.Typer(add_completion=False, rich_markup_mode="rich")
+
+
+@dataclass
+class Startup:
+    """One measured startup.
+
+    Attributes:
+        seconds (float): Time to compile and run sabc's module body
+        imports (dict[str, int]): Cumulative import time in microseconds of every top-level import
+        modules (set[str]): Every module imported
+    """
+
+    seconds: float
+    imports: dict[str, int]
+    modules: set[str]
+
+
+def _measure() -> Startup:
+    """Start sabc in a fresh interpreter with `-X importtime`.
+
+    Returns:
+        Startup: The startup time and what was imported
+
+    Raises:
+        typer.Exit: If sabc fails to start
+    """
+    scratch = tempfile.mkdtemp(prefix="check_startup_")
+    env = os.environ | {"XDG_CONFIG_HOME": scratch, "XDG_CACHE_HOME": scratch}
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", STARTUP_PROBE, str(SABC_PATH)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    if result.returncode:
+        errors = [
+            line for line in result.stderr.splitlines() if not line.startswith("import time:")
+        ]
+        Console(stderr=True).print("\n".join(errors))
+        raise typer.Exit(result.returncode)
+
+    imports = {}
+    modules = set()
+    lines = iter(result.stderr.splitlines())
+    # Skip the interpreter's own startup, which ends once the probe imports runpy
+    for line in lines:
+        if line.endswith("| runpy"):
+            break
+    for line in lines:
+        if not (match := IMPORTTIME_LINE.match(line)):
+            continue
+        _, cumulative, indent, module = match.groups()
+        modules.add(module)
+        # importtime indents nested imports by two spaces per level
+        if len(indent) == 1:
+            imports[module] = int(cumulative)
+    return Startup(seconds=float(result.stdout), imports=imports, modules=modules)
+
+
+@app.command()
+def main(
+    budget: Annotated[
+        float | None,
+        typer.Option(
+            help="Also fail when the best of --runs takes longer than this many milliseconds. \\[default: report only]",
+            show_default=False,
+        ),
+    ] = None,
+    runs: Annotated[int, typer.Option(min=1, help="Startups to measure")] = 5,
+    top: Annotated[int, typer.Option(min=0, help="Slowest top-level imports to list")] = 10,
+) -> None:
+    """Measure how long sabc takes to start, and fail when a deferred import regresses.
+
+    Every run starts a fresh interpreter with [code]-X importtime[/code] and compiles and runs sabc's module body, which is what a cron job pays before sabc does any work. Fails when a module sabc defers until use is imported at startup. Timings vary too much between runs and machines to gate on by default, so the fastest run is only reported unless [code]--budget[/code] is given.
+
+    [bold underline]Examples:[/bold underline]
+        [dim]Check the deferred imports and report the startup time[/dim]
+        $ scripts/check_startup.py
+
+        [dim]Also fail when startup takes longer than 250ms[/dim]
+        $ scripts/check_startup.py --budget 250
+    """
+    startups = [_measure() for _ in range(runs)]
+    best = min(startups, key=lambda startup: startup.seconds)
+    console = Console()
+
+    table = Table(title="Slowest imports")
+    table.add_column("Module")
+    table.add_column("Milliseconds", justify="right")
+    for module, micros in sorted(best.imports.items(), key=lambda item: -item[1])[:top]:
+        table.add_row(module, f"{micros / 1000:.1f}")
+    if top:
+        console.print(table)
+
+    failures = [
+        f"{module} is imported at startup" for module in DEFERRED_MODULES if module in best.modules
+    ]
+    milliseconds = best.seconds * 1000
+    if budget is not None and milliseconds > budget:
+        failures.append(f"Startup took {milliseconds:.1f}ms, over the {budget:g}ms budget")
+
+    for failure in failures:
+        console.print(f"[red]Failed[/red] {failure}")
+    if failures:
+        raise typer.Exit(1)
+    if budget is None:
+        console.print(f"Startup took {milliseconds:.1f}ms, every deferred module stays deferred")
+    else:
+        console.print(f"Startup took {milliseconds:.1f}ms, within the {budget:g}ms budget")
+
+
+if __name__ == "__main__":
+    app()